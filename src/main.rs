@@ -3,6 +3,7 @@
 
 use image::{DynamicImage, GenericImageView};
 use image::{ImageBuffer, Rgb};
+use imageproc::drawing;
 use lazy_static::lazy_static;
 use log::error;
 use pixels::{Pixels, SurfaceTexture};
@@ -102,6 +103,14 @@ fn apply_tools(
     (world, history)
 }
 
+// activates the tools matched by the predicate and deactivates all others
+fn activate_tool<P: Fn(&ToolWrapper) -> bool>(tools: &mut [ToolState], is_selected: P, msg: &str) {
+    println!("{}", msg);
+    for t in tools.iter_mut() {
+        t.is_active = is_selected(&t.tool);
+    }
+}
+
 fn loading_image(shape: Shape, counter: u128) -> DynamicImage {
     let radius = 7i32;
     let centers = [
@@ -110,25 +119,20 @@ fn loading_image(shape: Shape, counter: u128) -> DynamicImage {
         (shape.w - 30, shape.h - 20),
     ];
     let off_center_dim = |c_idx: usize, counter_mod: usize, rgb: &[u8; 3]| {
-        let mut res = *rgb;
-        for (rgb_idx, val) in rgb.iter().enumerate() {
-            if counter_mod != c_idx {
-                res[rgb_idx] = (*val as f32 * 0.7) as u8;
-            } else {
-                res[rgb_idx] = *val;
-            }
+        if counter_mod != c_idx {
+            rgb.map(|val| (val as f32 * 0.7) as u8)
+        } else {
+            *rgb
         }
-        res
     };
-    DynamicImage::ImageRgb8(ImageBuffer::from_fn(shape.w, shape.h, |x, y| {
-        for (c_idx, ctr) in centers.iter().enumerate() {
-            if (ctr.0 as i32 - x as i32).pow(2) + (ctr.1 as i32 - y as i32).pow(2) < radius.pow(2) {
-                let counter_mod = ((counter / 5) % 3) as usize;
-                return image::Rgb(off_center_dim(c_idx, counter_mod, &[195u8, 255u8, 205u8]));
-            }
-        }
-        image::Rgb([77u8, 77u8, 87u8])
-    }))
+    // instead of testing each pixel against all circles, only the circles' pixels are drawn
+    let mut im = ImageBuffer::from_pixel(shape.w, shape.h, Rgb([77u8, 77u8, 87u8]));
+    let counter_mod = ((counter / 5) % 3) as usize;
+    for (c_idx, ctr) in centers.iter().enumerate() {
+        let color = Rgb(off_center_dim(c_idx, counter_mod, &[195u8, 255u8, 205u8]));
+        drawing::draw_filled_circle_mut(&mut im, (ctr.0 as i32, ctr.1 as i32), radius, color);
+    }
+    DynamicImage::ImageRgb8(im)
 }
 
 fn remove_tmpdir() -> RvResult<()> {
@@ -231,35 +235,26 @@ fn main() -> Result<(), pixels::Error> {
 
             if input.key_held(VirtualKeyCode::RShift) || input.key_held(VirtualKeyCode::LShift) {
                 if input.key_pressed(VirtualKeyCode::B) {
-                    for t in tools.iter_mut() {
-                        if let ToolWrapper::Brush(_) = &t.tool {
-                            println!("activated brush tool");
-                            t.is_active = true;
-                        } else {
-                            t.is_active = false;
-                        }
-                    }
+                    activate_tool(
+                        &mut tools,
+                        |t| matches!(t, ToolWrapper::Brush(_)),
+                        "activated brush tool",
+                    );
                 } else if input.key_pressed(VirtualKeyCode::R) {
-                    for t in tools.iter_mut() {
-                        if let ToolWrapper::Rot90(_) = &t.tool {
-                            println!("activated rotate tool");
-                            t.is_active = true;
-                        } else {
-                            t.is_active = false;
-                        }
-                    }
+                    activate_tool(
+                        &mut tools,
+                        |t| matches!(t, ToolWrapper::Rot90(_)),
+                        "activated rotate tool",
+                    );
                 } else if input.key_pressed(VirtualKeyCode::Z) {
-                    for t in tools.iter_mut() {
-                        if let ToolWrapper::Zoom(_) = &t.tool {
-                            println!("activated zoom tool");
-                            t.is_active = true;
-                        } else {
-                            t.is_active = false;
-                        }
-                    }
+                    activate_tool(
+                        &mut tools,
+                        |t| matches!(t, ToolWrapper::Zoom(_)),
+                        "activated zoom tool",
+                    );
                 } else if input.key_pressed(VirtualKeyCode::Q) {
+                    println!("deactivated all tools");
                     for t in tools.iter_mut() {
-                        println!("deactivated all tools");
                         t.is_active = false;
                     }
                 }
@@ -324,9 +319,11 @@ fn main() -> Result<(), pixels::Error> {
                     let folder_label = make_folder_label();
                     let read_image_and_idx = match framework.menu_mut().read_image(*selected) {
                         Some(ri) => {
+                            // the history record shares the decoded background with the world
+                            let ims_raw = ImsRaw::new(ri);
                             if !undo_redo_load {
                                 history.push(Record {
-                                    ims_raw: ImsRaw::new(ri.clone()),
+                                    ims_raw: ims_raw.clone(),
                                     actor: LOAD_ACTOR_NAME,
                                     file_label_idx: file_selected,
                                     folder_label,
@@ -335,7 +332,7 @@ fn main() -> Result<(), pixels::Error> {
                             undo_redo_load = false;
                             file_selected = menu_file_selected;
                             is_loading_screen_active = false;
-                            (ImsRaw::new(ri), file_selected)
+                            (ims_raw, file_selected)
                         }
                         None => {
                             thread::sleep(Duration::from_millis(20));
@@ -1,10 +1,18 @@
 use crate::{
-    result::RvResult,
+    format_rverr,
+    result::{RvError, RvResult},
     types::{AsyncResultImage, ResultImage},
 };
 
 pub trait ReadImageToCache<A> {
     fn read(&self, path: &str) -> ResultImage;
+    /// Puts the image at `path` into the cache file `target`. The default decodes and re-encodes
+    /// the image. Readers with access to the raw bytes should copy them directly instead.
+    fn copy_to_cache(&self, path: &str, target: &str) -> RvResult<()> {
+        let im = self.read(path)?;
+        im.save(target)
+            .map_err(|e| format_rverr!("could not save image to {:?}. {}", target, e.to_string()))
+    }
     fn new(args: A) -> RvResult<Self>
     where
         Self: Sized;
@@ -2,10 +2,9 @@ use std::{collections::HashMap, fmt::Debug, fs, marker::PhantomData, path::Path}
 
 use crate::{
     cache::core::Cache,
-    format_rverr,
     result::{to_rv, RvError, RvResult},
     threadpool::ThreadPoolQueued,
-    types::{AsyncResultImage, ResultImage},
+    types::AsyncResultImage,
     util,
 };
 
@@ -13,45 +12,36 @@ use serde::{Deserialize, Serialize};
 
 use super::ReadImageToCache;
 
-fn copy<F>(path_or_url: &str, reader: F, target: &str) -> RvResult<()>
-where
-    F: Fn(&str) -> ResultImage,
-{
-    let im = reader(path_or_url)?;
-    im.save(&target)
-        .map_err(|e| format_rverr!("could not save image to {:?}. {}", target, e.to_string()))?;
-    Ok(())
-}
-
+// triggers the caching of all files that are not yet known to the cache and stores their job ids
 fn preload<'a, I, RTC, A>(
     files: I,
+    cached_paths: &mut HashMap<String, ThreadResult>,
     tp: &mut ThreadPoolQueued<RvResult<String>>,
     reader: &RTC,
     tmpdir: &str,
-) -> RvResult<HashMap<String, ThreadResult>>
+) -> RvResult<()>
 where
     I: Iterator<Item = (usize, &'a String)>,
     RTC: ReadImageToCache<A> + Clone + Send + 'static,
 {
     let delay_ms = 10;
     fs::create_dir_all(Path::new(tmpdir)).map_err(to_rv)?;
-    files
-        .map(|(prio, file)| {
-            let dst_file = util::filename_in_tmpdir(file, tmpdir)?;
-            let file_for_thread = file.clone();
-            let reader_for_thread = reader.clone();
-            let job = Box::new(move || {
-                match copy(&file_for_thread, |p| reader_for_thread.read(p), &dst_file) {
-                    Ok(_) => Ok(dst_file),
-                    Err(e) => Err(e),
-                }
-            });
-            Ok((
-                file.clone(),
-                ThreadResult::Running(tp.apply(job, prio, delay_ms)?),
-            ))
-        })
-        .collect::<RvResult<HashMap<_, _>>>()
+    for (prio, file) in files {
+        if cached_paths.contains_key(file) {
+            continue;
+        }
+        let dst_file = util::filename_in_tmpdir(file, tmpdir)?;
+        let file_for_thread = file.clone();
+        let reader_for_thread = reader.clone();
+        let job = Box::new(move || {
+            reader_for_thread
+                .copy_to_cache(&file_for_thread, &dst_file)
+                .map(|_| dst_file)
+        });
+        let th_res = ThreadResult::Running(tp.apply(job, prio, delay_ms)?);
+        cached_paths.insert(file.clone(), th_res);
+    }
+    Ok(())
 }
 
 #[derive(Debug)]
@@ -111,29 +101,23 @@ where
                 &files[idx],
             )
         });
-        // update priorities of in cache files
-        let files_in_cache = prio_file_pairs
+        // update priorities of in cache files that are still being loaded with one message
+        let prio_updates = prio_file_pairs
             .clone()
-            .filter(|(_, file)| self.cached_paths.contains_key(*file));
-        for (prio, file) in files_in_cache {
-            if let ThreadResult::Running(job_id) = self.cached_paths[file] {
-                self.tpq.update_prio(job_id, Some(prio))?;
-            }
-        }
+            .filter_map(|(prio, file)| match self.cached_paths.get(file) {
+                Some(ThreadResult::Running(job_id)) => Some((*job_id, Some(prio))),
+                _ => None,
+            })
+            .collect::<Vec<_>>();
+        self.tpq.update_prios(prio_updates)?;
         // trigger caching of not in cache files
-        let files_not_in_cache =
-            prio_file_pairs.filter(|(_, file)| !self.cached_paths.contains_key(*file));
-        let cache = preload(
-            files_not_in_cache,
+        preload(
+            prio_file_pairs,
+            &mut self.cached_paths,
             &mut self.tpq,
             &self.reader,
             &self.tmpdir,
         )?;
-        // update cache
-        for elt in cache.into_iter() {
-            let (file, th_res) = elt;
-            self.cached_paths.insert(file, th_res);
-        }
         let selected_file = &files[selected_file_idx];
         let selected_file_state = &self.cached_paths[selected_file];
         match selected_file_state {
@@ -230,10 +214,6 @@ fn test_file_cache() -> RvResult<()> {
             .filter(|(i, _)| min_i <= *i && *i < max_i)
         {
             let f = file.as_str();
-            println!(
-                "filename in tmpdir {:?}",
-                Path::new(util::filename_in_tmpdir(f, cfg.tmpdir()?)?.as_str())
-            );
             assert!(Path::new(util::filename_in_tmpdir(f, cfg.tmpdir()?)?.as_str()).exists());
         }
         Ok(())
@@ -22,7 +22,10 @@ const CFG_DEFAULT: &str = r#"
     "#;
 
 pub fn get_default_cfg() -> Cfg {
-    toml::from_str(CFG_DEFAULT).expect("default config broken")
+    lazy_static! {
+        static ref DEFAULT_CFG: Cfg = toml::from_str(CFG_DEFAULT).expect("default config broken");
+    }
+    DEFAULT_CFG.clone()
 }
 
 pub fn get_cfg_path() -> RvResult<PathBuf> {
@@ -44,6 +47,17 @@ pub fn get_cfg() -> RvResult<Cfg> {
 
 pub fn write_cfg(cfg: &Cfg) -> RvResult<()> {
     let cfg_str = toml::to_string_pretty(cfg).map_err(to_rv)?;
+    // an unchanged config is not rewritten such that formatting and comments of the file survive
+    let cfg_toml_path = get_cfg_path()?;
+    if cfg_toml_path.exists() {
+        let toml_str = fs::read_to_string(cfg_toml_path).map_err(to_rv)?;
+        let cfg_in_file = toml::from_str::<Cfg>(&toml_str)
+            .ok()
+            .and_then(|cfg| toml::to_string_pretty(&cfg).ok());
+        if cfg_in_file.as_deref() == Some(cfg_str.as_str()) {
+            return Ok(());
+        }
+    }
     write_cfg_str(&cfg_str)
 }
 
@@ -1,4 +1,5 @@
 use httparse::{Request, EMPTY_HEADER};
+use log::debug;
 use std::{
     fmt::Debug,
     io::{prelude::*, Read},
@@ -13,6 +14,9 @@ use crate::{
     result::{to_rv, RvError, RvResult},
 };
 
+// the response never changes, hence the bytes are written without any formatting
+const RESPONSE: &[u8] = b"HTTP/1.1 200 OK\r\n\r\n";
+
 #[derive(Debug, PartialEq)]
 enum HandleResult {
     Path(String),
@@ -33,7 +37,7 @@ fn handle_connection(buffer: &[u8]) -> RvResult<HandleResult> {
                 percent_encoding::percent_decode_str(&p[1..])
                     .decode_utf8()
                     .map_err(to_rv)?
-                    .to_string(),
+                    .into_owned(),
             )
         }),
         None => {
@@ -73,17 +77,15 @@ pub fn launch(address: String) -> LaunchResultType {
         for stream in listener.incoming() {
             let stream_processing_result: RvResult<HandleResult> = {
                 let mut stream = stream.map_err(to_rv)?;
-                stream.read(&mut buffer).map_err(to_rv)?;
+                let n_read = stream.read(&mut buffer).map_err(to_rv)?;
+                // only look at the bytes of this request, the rest of the buffer is stale
+                let received = &buffer[..n_read];
                 // we don't care about headers and bodies and strip everything after the first CRLF
-                let buffer_slice = if let Some(idx) =
-                    (0..(buffer.len() - 1)).find(|idx| &buffer[*idx..*idx + 2] == b"\r\n")
-                {
-                    &buffer[..idx + 2]
-                } else {
-                    &buffer
+                let buffer_slice = match received.windows(2).position(|w| w == b"\r\n") {
+                    Some(idx) => &received[..idx + 2],
+                    None => received,
                 };
-                let response = "HTTP/1.1 200 OK\r\n\r\n";
-                stream.write(response.as_bytes()).map_err(to_rv)?;
+                stream.write_all(RESPONSE).map_err(to_rv)?;
                 stream.flush().map_err(to_rv)?;
                 let res = handle_connection(buffer_slice);
                 let path = res?;
@@ -97,14 +99,14 @@ pub fn launch(address: String) -> LaunchResultType {
                         return Ok(());
                     }
                     HandleResult::Path(p_) => {
-                        println!("tcp listener sending result...");
+                        debug!("tcp listener sending result...");
                         let send_result = tx_from_server.send(Ok(p_));
-                        println!("done. {:?}", send_result);
+                        debug!("done. {:?}", send_result);
                         to_rv_or_send(&tx_from_server, send_result)?;
                     }
                 }
             }
-            println!("tcp listener waiting for new input");
+            debug!("tcp listener waiting for new input");
         }
         Ok(())
     });
@@ -113,18 +115,13 @@ pub fn launch(address: String) -> LaunchResultType {
 }
 
 fn increase_port(address: &str) -> RvResult<String> {
-    let address_wo_port = address.split(':').next();
-    let port = address.split(':').last();
-    if let Some(port) = port {
-        if let Some(address_wo_port) = address_wo_port {
-            Ok(format!(
-                "{}:{}",
-                address_wo_port,
-                (port.parse::<usize>().map_err(to_rv)? + 1)
-            ))
-        } else {
-            Err(format_rverr!("is address of {} missing?", address))
-        }
+    // a single split at the last colon separates address and port
+    if let Some((address_wo_port, port)) = address.rsplit_once(':') {
+        Ok(format!(
+            "{}:{}",
+            address_wo_port,
+            (port.parse::<usize>().map_err(to_rv)? + 1)
+        ))
     } else {
         Err(format_rverr!("is port of address {} missing?", address))
     }
@@ -209,5 +206,7 @@ fn test_launch() -> RvResult<()> {
 #[test]
 fn test_increase_port() -> RvResult<()> {
     assert_eq!(increase_port("address:1234")?, "address:1235");
+    assert_eq!(increase_port("127.0.0.1:5432")?, "127.0.0.1:5433");
+    assert!(increase_port("address").is_err());
     Ok(())
 }
@@ -12,13 +12,21 @@ pub struct CfgMenu<'a> {
     id: Id,
     cfg: &'a mut Cfg,
     ssh_cfg_str: &'a mut String,
+    // is only re-evaluated if the ssh config string changes and not in every frame
+    is_ssh_cfg_valid: &'a mut bool,
 }
 impl<'a> CfgMenu<'a> {
-    pub fn new(id: Id, cfg: &'a mut Cfg, ssh_cfg_str: &'a mut String) -> CfgMenu<'a> {
+    pub fn new(
+        id: Id,
+        cfg: &'a mut Cfg,
+        ssh_cfg_str: &'a mut String,
+        is_ssh_cfg_valid: &'a mut bool,
+    ) -> CfgMenu<'a> {
         Self {
             id,
             cfg,
             ssh_cfg_str,
+            is_ssh_cfg_valid,
         }
     }
 }
@@ -57,6 +65,7 @@ impl<'a> Widget for CfgMenu<'a> {
                                 *self.cfg = cfg;
                                 *self.ssh_cfg_str =
                                     toml::to_string_pretty(&self.cfg.ssh_cfg).unwrap();
+                                *self.is_ssh_cfg_valid = true;
                             } else {
                                 println!("could not reload cfg from file");
                             }
@@ -71,17 +80,20 @@ impl<'a> Widget for CfgMenu<'a> {
                         ui.radio_value(&mut self.cfg.cache, Cache::NoCache, "No cache");
                         ui.separator();
                         ui.label("SSH CONNECTION PARAMETERS");
-                        let clr = if is_valid_ssh_cfg(self.ssh_cfg_str) {
+                        let clr = if *self.is_ssh_cfg_valid {
                             Color32::LIGHT_YELLOW
                         } else {
                             Color32::LIGHT_RED
                         };
-                        ui.add(
+                        let ssh_cfg_resp = ui.add(
                             TextEdit::multiline(self.ssh_cfg_str)
                                 .desired_width(f32::INFINITY)
                                 .code_editor()
                                 .text_color(clr),
                         );
+                        if ssh_cfg_resp.changed() {
+                            *self.is_ssh_cfg_valid = is_valid_ssh_cfg(self.ssh_cfg_str);
+                        }
                         ui.horizontal(|ui| {
                             if ui.button("OK").clicked() {
                                 close = Close::Yes(true);
@@ -94,8 +106,14 @@ impl<'a> Widget for CfgMenu<'a> {
                 })
                 .response;
             if let Close::Yes(save) = close {
-                if save && is_valid_ssh_cfg(self.ssh_cfg_str) {
-                    self.cfg.ssh_cfg = toml::from_str::<SshCfg>(self.ssh_cfg_str).unwrap();
+                // parse and validate in one go instead of validating first and parsing again
+                let ssh_cfg = if save {
+                    toml::from_str::<SshCfg>(self.ssh_cfg_str).ok()
+                } else {
+                    None
+                };
+                if let Some(ssh_cfg) = ssh_cfg {
+                    self.cfg.ssh_cfg = ssh_cfg;
                     if let Err(e) = cfg::write_cfg(self.cfg) {
                         println!("could not write config,\n{:#?}", e);
                         println!("{:?}", self.cfg);
@@ -11,7 +11,10 @@ use image::DynamicImage;
 use pixels::{wgpu, PixelsContext};
 use winit::window::Window;
 
-use super::{open_folder::OpenFolder, paths_navigator::PathsNavigator};
+use super::{
+    open_folder::{OpenFolder, ReaderPathsInfo},
+    paths_navigator::PathsNavigator,
+};
 
 /// Manages all state required for rendering egui over `Pixels`.
 pub struct Framework {
@@ -136,16 +139,10 @@ pub enum Info {
     None,
 }
 
-fn show_popup(
-    ui: &mut Ui,
-    msg: &str,
-    icon: &str,
-    popup_id: Id,
-    info_message: Info,
-    below_respone: &Response,
-) -> Info {
+// returns true if the popup has been closed
+fn show_popup(ui: &mut Ui, msg: &str, icon: &str, popup_id: Id, below_respone: &Response) -> bool {
     ui.memory().open_popup(popup_id);
-    let mut new_msg = Info::None;
+    let mut is_closed = false;
     egui::popup_below_widget(ui, popup_id, below_respone, |ui| {
         let max_msg_len = 500;
         let shortened_msg = if msg.len() > max_msg_len {
@@ -154,13 +151,9 @@ fn show_popup(
             msg
         };
         ui.label(format!("{} {}", icon, shortened_msg));
-        new_msg = if ui.button("close").clicked() {
-            Info::None
-        } else {
-            info_message
-        }
+        is_closed = ui.button("close").clicked();
     });
-    new_msg
+    is_closed
 }
 
 pub fn get_cfg() -> (Cfg, Info) {
@@ -203,17 +196,16 @@ impl ToolsMenu {
             .open(&mut self.window_open)
             .show(ctx, |ui| {
                 ui.horizontal_top(|ui| {
-                    let active_tool = tools
-                        .iter_mut()
-                        .enumerate()
-                        .find(|(_, t)| ui.selectable_label(t.is_active, t.button_label).clicked());
-                    if let Some((idx_active, _)) = active_tool {
+                    // all buttons are drawn in one pass, also after a click
+                    let mut idx_clicked = None;
+                    for (i, t) in tools.iter().enumerate() {
+                        if ui.selectable_label(t.is_active, t.button_label).clicked() {
+                            idx_clicked = Some(i);
+                        }
+                    }
+                    if let Some(idx_active) = idx_clicked {
                         for (i, t) in tools.iter_mut().enumerate() {
-                            if i == idx_active {
-                                t.is_active = true;
-                            } else {
-                                t.is_active = false;
-                            }
+                            t.is_active = i == idx_active;
                         }
                     }
                 })
@@ -231,7 +223,8 @@ pub struct Menu {
     paths_navigator: PathsNavigator,
     cfg: Cfg,
     ssh_cfg_str: String,
-    tp: ThreadPool<(ReaderFromCfg, Info)>,
+    is_ssh_cfg_valid: bool,
+    tp: ThreadPool<ReaderPathsInfo>,
     last_open_folder_job_id: Option<u128>,
     scroll_offset: f32,
 }
@@ -250,6 +243,7 @@ impl Menu {
             paths_navigator: PathsNavigator::new(None),
             cfg,
             ssh_cfg_str,
+            is_ssh_cfg_valid: true,
             tp: ThreadPool::new(1),
             last_open_folder_job_id: None,
             scroll_offset: 0.0,
@@ -323,8 +317,7 @@ impl Menu {
                     .paths_selector()
                     .as_ref()
                     .map_or(Ok(None), |ps| {
-                        let ffp = ps.filtered_file_paths();
-                        r.read_image(file_label_selected_idx, &ffp)
+                        r.read_image(file_label_selected_idx, ps.filtered_file_paths())
                     }),
                 self
             )
@@ -341,15 +334,15 @@ impl Menu {
                 // Popup for error messages
                 let popup_id = ui.make_persistent_id("info-popup");
                 let r = ui.separator();
-                self.info_message = match &self.info_message {
-                    Info::Warning(msg) => {
-                        show_popup(ui, msg, "❕", popup_id, self.info_message.clone(), &r)
-                    }
-                    Info::Error(msg) => {
-                        show_popup(ui, msg, "❌", popup_id, self.info_message.clone(), &r)
-                    }
-                    Info::None => Info::None,
+                // the message is only borrowed while shown and not cloned each frame
+                let is_closed = match &self.info_message {
+                    Info::Warning(msg) => show_popup(ui, msg, "❕", popup_id, &r),
+                    Info::Error(msg) => show_popup(ui, msg, "❌", popup_id, &r),
+                    Info::None => false,
                 };
+                if is_closed {
+                    self.info_message = Info::None;
+                }
 
                 // Top row with open folder and settings button
                 ui.horizontal(|ui| {
@@ -369,14 +362,26 @@ impl Menu {
                         self
                     );
                     let popup_id = ui.make_persistent_id("cfg-popup");
-                    let cfg_gui = CfgMenu::new(popup_id, &mut self.cfg, &mut self.ssh_cfg_str);
+                    let cfg_gui = CfgMenu::new(
+                        popup_id,
+                        &mut self.cfg,
+                        &mut self.ssh_cfg_str,
+                        &mut self.is_ssh_cfg_valid,
+                    );
                     ui.add(cfg_gui);
                 });
 
                 // check if connection is after open folder is ready
-                let mut assign_open_folder_res = |reader_n_info: Option<(ReaderFromCfg, Info)>| {
-                    if let Some((reader, info)) = reader_n_info {
+                let open_folder_res = menu::open_folder::check_if_connected(
+                    ui,
+                    &mut self.last_open_folder_job_id,
+                    self.paths_navigator.paths_selector(),
+                    &mut self.tp,
+                );
+                let mut assign_open_folder_res = |reader_n_info: Option<ReaderPathsInfo>| {
+                    if let Some((reader, paths_selector, info)) = reader_n_info {
                         self.reader = Some(reader);
+                        self.paths_navigator = PathsNavigator::new(paths_selector);
                         match info {
                             Info::None => (),
                             _ => {
@@ -385,31 +390,7 @@ impl Menu {
                         }
                     }
                 };
-                handle_error!(
-                    assign_open_folder_res,
-                    menu::open_folder::check_if_connected(
-                        ui,
-                        &mut self.last_open_folder_job_id,
-                        self.paths_navigator.paths_selector(),
-                        &mut self.tp,
-                    ),
-                    self
-                );
-                if self.paths_navigator.paths_selector().is_none() {
-                    if let OpenFolder::Some(open_folder) = &self.opened_folder {
-                        handle_error!(
-                            |ps| {
-                                self.paths_navigator = PathsNavigator::new(ps);
-                            },
-                            {
-                                self.reader
-                                    .as_ref()
-                                    .map_or(Ok(None), |r| r.open_folder(open_folder).map(Some))
-                            },
-                            self
-                        );
-                    }
-                }
+                handle_error!(assign_open_folder_res, open_folder_res, self);
 
                 // filter text field
                 let txt_field = ui.text_edit_singleline(&mut self.filter_string);
@@ -4,11 +4,13 @@ use crate::{
     cfg::{Cfg, Connection},
     menu::{core::Info, paths_navigator::PathsNavigator},
     paths_selector::PathsSelector,
-    reader::ReaderFromCfg,
+    reader::{LoadImageForGui, ReaderFromCfg},
     result::{RvError, RvResult},
     threadpool::ThreadPool,
 };
 
+pub type ReaderPathsInfo = (ReaderFromCfg, Option<PathsSelector>, Info);
+
 pub enum OpenFolder {
     None,
     PopupOpen,
@@ -55,22 +57,34 @@ fn make_reader_from_cfg(cfg: &Cfg) -> (ReaderFromCfg, Info) {
         ),
     }
 }
+// listing the folder might need network access and is hence done in the same
+// background job that creates the reader
+fn make_reader_and_open_folder(cfg: &Cfg, folder_path: &str) -> ReaderPathsInfo {
+    let (reader, info) = make_reader_from_cfg(cfg);
+    match reader.open_folder(folder_path) {
+        Ok(ps) => (reader, Some(ps), info),
+        Err(e) => (reader, None, Info::Error(e.to_string())),
+    }
+}
 pub fn button(
     ui: &mut Ui,
     paths_navigator: &mut PathsNavigator,
     open_folder: OpenFolder,
     cfg: Cfg,
     last_open_folder_job_id: &mut Option<u128>,
-    tp: &mut ThreadPool<(ReaderFromCfg, Info)>,
+    tp: &mut ThreadPool<ReaderPathsInfo>,
 ) -> RvResult<OpenFolder> {
     let resp = ui.button("open folder");
     fn open_effects(
-        tp: &mut ThreadPool<(ReaderFromCfg, Info)>,
+        tp: &mut ThreadPool<ReaderPathsInfo>,
         cfg: Cfg,
+        folder_path: String,
     ) -> RvResult<(PathsNavigator, Option<u128>)> {
         Ok((
             PathsNavigator::new(None),
-            Some(tp.apply(Box::new(move || make_reader_from_cfg(&cfg)))?),
+            Some(tp.apply(Box::new(move || {
+                make_reader_and_open_folder(&cfg, &folder_path)
+            }))?),
         ))
     }
     if resp.clicked() {
@@ -79,12 +93,13 @@ pub fn button(
                 let sf = rfd::FileDialog::new()
                     .pick_folder()
                     .ok_or_else(|| RvError::new("Could not pick folder."))?;
-                (*paths_navigator, *last_open_folder_job_id) = open_effects(tp, cfg)?;
-                Ok(OpenFolder::Some(
-                    sf.to_str()
-                        .ok_or_else(|| RvError::new("could not transfer path to unicode string"))?
-                        .to_string(),
-                ))
+                let folder_path = sf
+                    .to_str()
+                    .ok_or_else(|| RvError::new("could not transfer path to unicode string"))?
+                    .to_string();
+                (*paths_navigator, *last_open_folder_job_id) =
+                    open_effects(tp, cfg, folder_path.clone())?;
+                Ok(OpenFolder::Some(folder_path))
             }
             Connection::Ssh => Ok(OpenFolder::PopupOpen),
         }
@@ -92,9 +107,10 @@ pub fn button(
         match open_folder {
             OpenFolder::PopupOpen => {
                 let picked = pick_folder_from_list(ui, &cfg.ssh_cfg.remote_folder_paths, &resp)?;
-                if let OpenFolder::Some(_) = picked {
+                if let OpenFolder::Some(folder_path) = &picked {
                     // this is when in the openfolder popup a folder has been selected
-                    (*paths_navigator, *last_open_folder_job_id) = open_effects(tp, cfg)?;
+                    (*paths_navigator, *last_open_folder_job_id) =
+                        open_effects(tp, cfg, folder_path.clone())?;
                 }
                 Ok(picked)
             }
@@ -107,8 +123,8 @@ pub fn check_if_connected(
     ui: &mut Ui,
     last_open_folder_job_id: &mut Option<u128>,
     paths_selector: &Option<PathsSelector>,
-    tp: &mut ThreadPool<(ReaderFromCfg, Info)>,
-) -> RvResult<Option<(ReaderFromCfg, Info)>> {
+    tp: &mut ThreadPool<ReaderPathsInfo>,
+) -> RvResult<Option<ReaderPathsInfo>> {
     if let Some(job_id) = last_open_folder_job_id {
         ui.label("connecting...");
         let tp_res = tp.result(*job_id);
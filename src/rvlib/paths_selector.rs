@@ -1,4 +1,4 @@
-use std::path::Path;
+use std::{collections::HashMap, path::Path};
 
 use crate::{
     format_rverr,
@@ -15,21 +15,46 @@ pub fn to_name_str(p: &Path) -> RvResult<&str> {
     util::osstr_to_str(p.file_name())
         .map_err(|e| format_rverr!("could not transform '{:?}' due to '{:?}'", p, e))
 }
-fn list_file_labels(file_paths: &[String], filter_str: &str) -> RvResult<Vec<(usize, String)>> {
+fn list_file_labels(file_paths: &[String]) -> RvResult<Vec<String>> {
     file_paths
         .iter()
-        .enumerate()
-        .filter(|(_, p)| {
-            if filter_str.is_empty() {
-                true
-            } else {
-                p.contains(filter_str)
-            }
-        })
-        .map(|(i, p)| Ok((i, to_name_str(Path::new(p))?.to_string())))
+        .map(|p| Ok(to_name_str(Path::new(p))?.to_string()))
         .collect::<RvResult<Vec<_>>>()
 }
 
+fn filter_file_labels(
+    file_paths: &[String],
+    file_labels: &[String],
+    filter_str: &str,
+) -> Vec<(usize, String)> {
+    file_paths
+        .iter()
+        .zip(file_labels.iter())
+        .enumerate()
+        .filter(|(_, (p, _))| filter_str.is_empty() || p.contains(filter_str))
+        .map(|(i, (_, fl))| (i, fl.clone()))
+        .collect::<Vec<_>>()
+}
+
+fn filter_file_paths(
+    file_paths: &[String],
+    filtered_file_labels: &[(usize, String)],
+) -> Vec<String> {
+    filtered_file_labels
+        .iter()
+        .map(|(idx, _)| file_paths[*idx].clone())
+        .collect()
+}
+
+// the first occurrence of a label wins, as in a linear search through the filtered labels
+fn map_label_to_idx(filtered_file_labels: &[(usize, String)]) -> HashMap<String, usize> {
+    let mut label_to_idx = HashMap::with_capacity(filtered_file_labels.len());
+    for (idx, (_, fl)) in filtered_file_labels.iter().enumerate() {
+        label_to_idx.entry(fl.clone()).or_insert(idx);
+    }
+    label_to_idx
+}
+
 fn make_folder_label(folder_path: Option<&str>) -> RvResult<String> {
     match folder_path {
         Some(sf) => {
@@ -48,7 +73,13 @@ fn make_folder_label(folder_path: Option<&str>) -> RvResult<String> {
 
 pub struct PathsSelector {
     file_paths: Vec<String>,
+    // labels of all paths are computed once such that filtering does not need to parse paths
+    file_labels: Vec<String>,
     filtered_file_labels: Vec<(usize, String)>,
+    // the filtered paths are needed for each image read and only change with the filter
+    filtered_file_paths: Vec<String>,
+    // maps a label to its index among the filtered labels, changes only with the filter
+    filtered_label_to_idx: HashMap<String, usize>,
     folder_label: String,
 }
 
@@ -59,11 +90,17 @@ impl PathsSelector {
 
     pub fn new(mut file_paths: Vec<String>, folder_path: Option<String>) -> RvResult<Self> {
         file_paths.sort();
-        let filtered_file_labels = list_file_labels(&file_paths, "")?;
+        let file_labels = list_file_labels(&file_paths)?;
+        let filtered_file_labels = filter_file_labels(&file_paths, &file_labels, "");
+        let filtered_file_paths = filter_file_paths(&file_paths, &filtered_file_labels);
+        let filtered_label_to_idx = map_label_to_idx(&filtered_file_labels);
         let folder_label = make_folder_label(folder_path.as_deref())?;
         Ok(PathsSelector {
             file_paths,
+            file_labels,
             filtered_file_labels,
+            filtered_file_paths,
+            filtered_label_to_idx,
             folder_label,
         })
     }
@@ -73,7 +110,10 @@ impl PathsSelector {
     }
 
     pub fn filter(&mut self, filter_str: &str) -> RvResult<()> {
-        self.filtered_file_labels = list_file_labels(&self.file_paths, filter_str)?;
+        self.filtered_file_labels =
+            filter_file_labels(&self.file_paths, &self.file_labels, filter_str);
+        self.filtered_file_paths = filter_file_paths(&self.file_paths, &self.filtered_file_labels);
+        self.filtered_label_to_idx = map_label_to_idx(&self.filtered_file_labels);
         Ok(())
     }
 
@@ -81,11 +121,8 @@ impl PathsSelector {
         &self.filtered_file_labels
     }
 
-    pub fn filtered_file_paths(&self) -> Vec<String> {
-        self.filtered_file_labels
-            .iter()
-            .map(|(idx, _)| self.file_paths[*idx].clone())
-            .collect()
+    pub fn filtered_file_paths(&self) -> &[String] {
+        &self.filtered_file_paths
     }
 
     pub fn folder_label(&self) -> &str {
@@ -93,10 +130,6 @@ impl PathsSelector {
     }
 
     pub fn idx_of_file_label(&self, file_label: &str) -> Option<usize> {
-        self.filtered_file_labels
-            .iter()
-            .enumerate()
-            .find(|(_, (_, fl))| fl == file_label)
-            .map(|(idx, _)| idx)
+        self.filtered_label_to_idx.get(file_label).copied()
     }
 }
@@ -1,3 +1,5 @@
+use std::fs;
+
 use walkdir::WalkDir;
 
 use crate::{
@@ -42,4 +44,8 @@ impl ReadImageToCache<CloneDummy> for ReadImageFromPath {
     fn read(&self, path: &str) -> ResultImage {
         util::read_image(path)
     }
+    fn copy_to_cache(&self, path: &str, target: &str) -> RvResult<()> {
+        fs::copy(path, target).map_err(to_rv)?;
+        Ok(())
+    }
 }
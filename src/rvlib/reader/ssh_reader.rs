@@ -38,4 +38,7 @@ impl ReadImageToCache<SshCfg> for ReadImageFromSsh {
         let image_byte_blob = ssh::download(remote_file_path, &self.sess)?;
         image::load_from_memory(&image_byte_blob).map_err(to_rv)
     }
+    fn copy_to_cache(&self, remote_file_path: &str, target: &str) -> RvResult<()> {
+        ssh::download_to_file(remote_file_path, &self.sess, target)
+    }
 }
@@ -1,23 +1,50 @@
-use std::{io::Read, net::TcpStream, path::Path};
+use std::{
+    fs,
+    io::{self, Read},
+    net::{TcpStream, ToSocketAddrs},
+    path::Path,
+    time::Duration,
+};
 
-use ssh2::Session;
+use ssh2::{Channel, Session};
 
 use crate::{
     cfg::SshCfg,
-    result::{to_rv, RvResult},
+    format_rverr,
+    result::{to_rv, RvError, RvResult},
 };
 
 pub fn download(remote_src_file_path: &str, sess: &Session) -> RvResult<Vec<u8>> {
-    let (mut remote_file, _) = sess
+    let (mut remote_file, stat) = sess
         .scp_recv(Path::new(remote_src_file_path))
         .map_err(to_rv)?;
-    let mut content = vec![];
+    // the size is known upfront, so the buffer does not need to grow while reading
+    let mut content = Vec::with_capacity(stat.size() as usize);
     remote_file.read_to_end(&mut content).map_err(to_rv)?;
+    close_scp_channel(remote_file)?;
+    Ok(content)
+}
+
+/// Streams the remote file directly into the destination file without holding it in memory
+pub fn download_to_file(
+    remote_src_file_path: &str,
+    sess: &Session,
+    dst_file_path: &str,
+) -> RvResult<()> {
+    let (mut remote_file, _) = sess
+        .scp_recv(Path::new(remote_src_file_path))
+        .map_err(to_rv)?;
+    let mut dst_file = fs::File::create(dst_file_path).map_err(to_rv)?;
+    io::copy(&mut remote_file, &mut dst_file).map_err(to_rv)?;
+    close_scp_channel(remote_file)
+}
+
+fn close_scp_channel(mut remote_file: Channel) -> RvResult<()> {
     remote_file.send_eof().map_err(to_rv)?;
     remote_file.wait_eof().map_err(to_rv)?;
     remote_file.close().map_err(to_rv)?;
     remote_file.wait_close().map_err(to_rv)?;
-    Ok(content)
+    Ok(())
 }
 
 pub fn find(
@@ -28,27 +55,26 @@ pub fn find(
     let mut channel = sess.channel_session().map_err(to_rv)?;
 
     let mut s = String::new();
+    // single quotes inside the path would end the quoted argument of the remote shell
+    let quoted_path = remote_folder_path.replace('\'', "'\\''");
     channel
-        .exec(format!("find '{}'", remote_folder_path).as_str())
+        .exec(format!("find '{}'", quoted_path).as_str())
         .map_err(to_rv)?;
 
     channel.read_to_string(&mut s).map_err(to_rv)?;
     channel.wait_close().map_err(to_rv)?;
+    // find also fails if only some sub-folders are not readable, so we only give up if
+    // nothing was listed at all
+    let exit_status = channel.exit_status().map_err(to_rv)?;
+    if exit_status != 0 && s.is_empty() {
+        return Err(format_rverr!(
+            "could not list '{}', find exited with {}",
+            remote_folder_path,
+            exit_status
+        ));
+    }
     fn ext_predicate(s: &str, filter_extensions: &[&str]) -> bool {
-        let n_s = s.len();
-        filter_extensions
-            .iter()
-            .filter(|ext| {
-                let n_e = ext.len();
-                if n_e > n_s {
-                    false
-                } else {
-                    &s[n_s - n_e..n_s] == **ext
-                }
-            })
-            .count()
-            > 0
-            || filter_extensions.is_empty()
+        filter_extensions.is_empty() || filter_extensions.iter().any(|ext| s.ends_with(ext))
     }
     Ok(s.split('\n')
         .filter(|s| ext_predicate(s, filter_extensions))
@@ -56,8 +82,25 @@ pub fn find(
         .collect::<Vec<_>>())
 }
 
+const CONNECT_TIMEOUT: Duration = Duration::from_secs(5);
+
+// an unreachable host fails after the timeout instead of blocking for the OS default
+fn connect(address: &str) -> RvResult<TcpStream> {
+    let mut last_err = None;
+    for socket_addr in address.to_socket_addrs().map_err(to_rv)? {
+        match TcpStream::connect_timeout(&socket_addr, CONNECT_TIMEOUT) {
+            Ok(tcp) => return Ok(tcp),
+            Err(e) => last_err = Some(e),
+        }
+    }
+    Err(match last_err {
+        Some(e) => to_rv(e),
+        None => format_rverr!("could not resolve address {}", address),
+    })
+}
+
 pub fn auth(ssh_cfg: &SshCfg) -> RvResult<Session> {
-    let tcp = TcpStream::connect(&ssh_cfg.address).map_err(to_rv)?;
+    let tcp = connect(&ssh_cfg.address)?;
     let mut sess = Session::new().map_err(to_rv)?;
     sess.set_tcp_stream(tcp);
     sess.handshake().map_err(to_rv)?;
@@ -1,8 +1,13 @@
 use crate::result::{to_rv, RvError, RvResult};
+use log::debug;
 
 use std::{
+    collections::HashMap,
     fmt::{self, Debug, Formatter},
-    sync::mpsc::{self, Receiver, Sender},
+    sync::{
+        mpsc::{self, Receiver, Sender},
+        Arc, Mutex,
+    },
     thread,
     time::{self, Duration, Instant},
 };
@@ -51,22 +56,13 @@ enum Message<J> {
 
 pub fn result<T: Send + 'static>(
     rx_from_pool: &mut Receiver<(u128, T)>,
-    result_queue: &mut Vec<(u128, T)>,
+    result_queue: &mut HashMap<u128, T>,
     job_id: u128,
 ) -> Option<T> {
+    // results are keyed by job id such that polling many running jobs does not
+    // scan the queue for each of them
     result_queue.extend(rx_from_pool.try_iter());
-    let result = result_queue
-        .iter()
-        .enumerate()
-        .find(|(_, (jid, _))| job_id == *jid);
-
-    match result {
-        None => None,
-        Some((vec_idx, _)) => {
-            let (_, v) = result_queue.remove(vec_idx);
-            Some(v)
-        }
-    }
+    result_queue.remove(&job_id)
 }
 
 fn send_answer_message<T>(
@@ -78,7 +74,7 @@ fn send_answer_message<T>(
     let send_result = tx_from_pool.send((job_id, f()));
     match send_result {
         Ok(_) => {
-            println!("thread {} send a result.", idx_thread);
+            debug!("thread {} send a result.", idx_thread);
             Some(())
         }
         Err(e) => {
@@ -91,26 +87,29 @@ fn send_answer_message<T>(
 type Tx2Tp<T> = Sender<Message<(u128, Job<T>)>>;
 #[allow(dead_code)]
 pub struct ThreadPool<T: Send + 'static> {
-    txs_to_pool: Vec<Tx2Tp<T>>,
+    // all threads take their jobs from the same channel, such that a free thread picks up the
+    // next job instead of jobs waiting behind a long running one
+    tx_to_pool: Tx2Tp<T>,
+    n_threads: usize,
     rx_from_pool: Receiver<(u128, T)>,
-    next_thread: usize,
     job_id: u128,
-    result_queue: Vec<(u128, T)>,
+    result_queue: HashMap<u128, T>,
     interval_millis: u64,
     timeout_millis: Option<u128>,
 }
 impl<T: Send + 'static> ThreadPool<T> {
     pub fn new(n_threads: usize) -> Self {
-        let mut txs_to_pool = Vec::with_capacity(n_threads);
         let (tx_from_pool, rx_from_pool) = mpsc::channel();
+        let (tx_to_pool, rx_to_pool) = mpsc::channel();
+        let rx_to_pool = Arc::new(Mutex::new(rx_to_pool));
         for idx_thread in 0..n_threads {
-            let (tx_to_pool, rx_to_pool) = mpsc::channel();
-            txs_to_pool.push(tx_to_pool);
+            let rx = Arc::clone(&rx_to_pool);
             let tx = tx_from_pool.clone();
             let thread = move || -> RvResult<()> {
                 println!("spawning thread {}", idx_thread);
                 loop {
-                    let received_msg = rx_to_pool.recv().map_err(to_rv)?;
+                    // the lock is released at the end of this statement, i.e., before the job runs
+                    let received_msg = rx.lock().map_err(to_rv)?.recv().map_err(to_rv)?;
                     match received_msg {
                         Message::Terminate => {
                             println!("shut down thread {}", idx_thread);
@@ -125,11 +124,11 @@ impl<T: Send + 'static> ThreadPool<T> {
             thread::spawn(thread);
         }
         ThreadPool {
-            txs_to_pool,
+            tx_to_pool,
+            n_threads,
             rx_from_pool,
-            next_thread: 0usize,
             job_id: 0u128,
-            result_queue: vec![],
+            result_queue: HashMap::new(),
             interval_millis: 10,
             timeout_millis: None,
         }
@@ -139,15 +138,10 @@ impl<T: Send + 'static> ThreadPool<T> {
         result(&mut self.rx_from_pool, &mut self.result_queue, job_id)
     }
     fn apply_id(&mut self, f: Job<T>, job_id: u128) -> RvResult<()> {
-        if self.next_thread == self.txs_to_pool.len() {
-            self.next_thread = 0;
-        }
-        println!("sending id {:?}", job_id);
-        self.txs_to_pool[self.next_thread]
+        debug!("sending id {:?}", job_id);
+        self.tx_to_pool
             .send(Message::NewJob((job_id, f)))
             .map_err(|e| RvError::new(&e.to_string()))?;
-        self.next_thread += 1;
-
         Ok(())
     }
     pub fn apply(&mut self, f: Job<T>) -> RvResult<u128> {
@@ -172,8 +166,9 @@ impl<T: Send + 'static> ThreadPool<T> {
 }
 
 fn terminate_all_threads<T: Send + 'static>(tp: &ThreadPool<T>) -> RvResult<()> {
-    for tx in &tp.txs_to_pool {
-        tx.send(Message::Terminate).map_err(to_rv)?;
+    // each thread stops after receiving one terminate message
+    for _ in 0..tp.n_threads {
+        tp.tx_to_pool.send(Message::Terminate).map_err(to_rv)?;
     }
     Ok(())
 }
@@ -216,11 +211,13 @@ fn submit_job<T: Send + 'static>(
 ) -> RvResult<()> {
     if n_threads > jobs_running.len() {
         let n_jobs = jobs_queue.len();
+        // the clock is read once for all queued jobs instead of once per job
+        let now = Instant::now();
         // look for the job with the highest priority and execute that
         if let Some((max_prio_idx, _)) = jobs_queue
             .iter()
             .enumerate()
-            .filter(|(_, j)| j.started.elapsed().as_millis() >= j.delay_ms)
+            .filter(|(_, j)| now.duration_since(j.started).as_millis() >= j.delay_ms)
             .max_by_key(|(_, j)| j.prio)
         {
             jobs_queue.swap(max_prio_idx, n_jobs - 1);
@@ -252,8 +249,8 @@ pub struct ThreadPoolQueued<T: Send + 'static> {
     job_id: u128,
     tx_job_to_pool: Sender<Message<JobQueued<T>>>,
     rx_job_result_from_pool: Receiver<(u128, T)>,
-    tx_prio_to_pool: Sender<(u128, Option<usize>)>, // send job id and new priority
-    result_queue: Vec<(u128, T)>,
+    tx_prio_to_pool: Sender<Vec<(u128, Option<usize>)>>, // send job ids and new priorities
+    result_queue: HashMap<u128, T>,
 }
 impl<T: Send + 'static> ThreadPoolQueued<T> {
     pub fn new(n_threads: usize) -> Self {
@@ -277,35 +274,26 @@ impl<T: Send + 'static> ThreadPoolQueued<T> {
                     }
                 }
                 // update priorities
-                for (job_id_to_change, new_prio) in rx_prio_to_pool.try_iter() {
-                    update_prio(job_id_to_change, new_prio, &mut jobs_queue);
+                for prio_updates in rx_prio_to_pool.try_iter() {
+                    for (job_id_to_change, new_prio) in prio_updates {
+                        update_prio(job_id_to_change, new_prio, &mut jobs_queue);
+                    }
                 }
 
                 submit_job(n_threads, &mut jobs_running, &mut jobs_queue, &mut tp)?;
 
-                // send results of finished jobs
-                let results = jobs_running
-                    .iter()
-                    .map(|job_id| tp.result(*job_id))
-                    .collect::<Vec<_>>();
-                let mut finished_job_ids: Vec<u128> = Vec::new();
-                jobs_running = jobs_running
-                    .into_iter()
-                    .enumerate()
-                    .filter(|(i, job_id)| match results[*i] {
-                        None => true,
-                        Some(_) => {
-                            finished_job_ids.push(*job_id);
-                            false
+                // send results of finished jobs and keep the running ones in a single pass
+                let mut send_result = Ok(());
+                jobs_running.retain(|job_id| match tp.result(*job_id) {
+                    None => true,
+                    Some(res) => {
+                        if send_result.is_ok() {
+                            send_result = tx_job_result_from_pool.send((*job_id, res));
                         }
-                    })
-                    .map(|(_, job_id)| job_id)
-                    .collect::<Vec<_>>();
-                for (i, res) in results.into_iter().flatten().enumerate() {
-                    tx_job_result_from_pool
-                        .send((finished_job_ids[i], res))
-                        .map_err(to_rv)?;
-                }
+                        false
+                    }
+                });
+                send_result.map_err(to_rv)?;
                 thread::sleep(Duration::from_millis(1));
             }
         };
@@ -315,7 +303,7 @@ impl<T: Send + 'static> ThreadPoolQueued<T> {
             tx_job_to_pool,
             rx_job_result_from_pool,
             tx_prio_to_pool,
-            result_queue: vec![],
+            result_queue: HashMap::new(),
         }
     }
     pub fn apply(&mut self, job: Job<T>, prio: usize, delay_ms: u128) -> RvResult<u128> {
@@ -335,11 +323,12 @@ impl<T: Send + 'static> ThreadPoolQueued<T> {
         };
         Ok(self.job_id - 1)
     }
-    /// Updates the priority if not yet submitted, None means cancel
-    pub fn update_prio(&self, job_id: u128, new_prio: Option<usize>) -> RvResult<()> {
-        self.tx_prio_to_pool
-            .send((job_id, new_prio))
-            .map_err(to_rv)?;
+    /// Updates the priorities of jobs not yet submitted with a single message to the pool, None
+    /// means cancel
+    pub fn update_prios(&self, prio_updates: Vec<(u128, Option<usize>)>) -> RvResult<()> {
+        if !prio_updates.is_empty() {
+            self.tx_prio_to_pool.send(prio_updates).map_err(to_rv)?;
+        }
         Ok(())
     }
     pub fn result(&mut self, job_id: u128) -> Option<T> {
@@ -390,7 +379,6 @@ fn make_test_queue() -> Vec<JobQueued<i32>> {
 fn test_prio() -> RvResult<()> {
     let mut jobs_queue = make_test_queue();
     let mut test_update_prio = |job_id_to_change, new_prio| -> RvResult<()> {
-        println!("setting {} to {:?}", job_id_to_change, new_prio);
         update_prio(job_id_to_change, new_prio, &mut jobs_queue);
         assert_eq!(
             jobs_queue
@@ -458,12 +446,12 @@ fn test_tp_queued() -> RvResult<()> {
 fn test_tp_update_prio() -> RvResult<()> {
     let mut tpq = ThreadPoolQueued::new(1);
     let jid = tpq.apply(make_test_job_sleep(5, 20), 0, 10)?;
-    tpq.update_prio(jid, None)?;
+    tpq.update_prios(vec![(jid, None)])?;
     thread::sleep(Duration::from_millis(140));
     assert_eq!(tpq.result(jid), None);
     let jid_1 = tpq.apply(make_test_job_sleep(5, 20), 0, 30)?;
     let jid_2 = tpq.apply(make_test_job_sleep(10, 20), 1, 30)?;
-    tpq.update_prio(jid_1, Some(10))?;
+    tpq.update_prios(vec![(jid_1, Some(10))])?;
     for _ in 30..250 {
         thread::sleep(Duration::from_millis(1));
         let r1 = tpq.result(jid_1);
@@ -542,3 +530,15 @@ fn test_tp() -> RvResult<()> {
 
     Ok(())
 }
+#[test]
+fn test_tp_free_thread_takes_next_job() -> RvResult<()> {
+    let mut tp = ThreadPool::new(2);
+    let jid_long = tp.apply(make_test_job_sleep(1, 400))?;
+    let jid_short_1 = tp.apply(make_test_job_sleep(2, 10))?;
+    let jid_short_2 = tp.apply(make_test_job_sleep(3, 10))?;
+    thread::sleep(Duration::from_millis(150));
+    assert_eq!(tp.result(jid_short_1), Some(2));
+    assert_eq!(tp.result(jid_short_2), Some(3));
+    assert_eq!(tp.result(jid_long), None);
+    Ok(())
+}
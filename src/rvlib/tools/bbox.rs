@@ -4,7 +4,7 @@ use crate::{
     make_tool_transform,
     tools::core,
     types::ViewImage,
-    util::{mouse_pos_to_orig_pos, Shape},
+    util::{mouse_pos_to_orig_pos, Shape, BB},
     world::World,
     LEFT_BTN, RIGHT_BTN,
 };
@@ -46,15 +46,29 @@ impl BBox {
                     (pp.0 as usize, pp.1 as usize),
                     Rgba([255, 255, 255, 255]),
                 );
+                // only the part of the view that shows the new box needs to be blended
+                let bx_bb = BB {
+                    x: mp.0.min(pp.0),
+                    y: mp.1.min(pp.1),
+                    w: mp.0.max(pp.0) - mp.0.min(pp.0),
+                    h: mp.1.max(pp.1) - mp.1.min(pp.1),
+                };
                 let zoom_box = *world.zoom_box();
-                world
-                    .ims_raw
-                    .annotation_on_view(&mut world.im_view, shape_win, &zoom_box);
+                world.ims_raw.annotation_on_view(
+                    &mut world.im_view,
+                    shape_win,
+                    &zoom_box,
+                    &Some(bx_bb),
+                );
                 history.push(Record::new(world.ims_raw.clone(), ACTOR_NAME));
                 self.prev_pos = None;
             } else {
                 self.prev_pos = mouse_pos;
-                self.initial_view = Some(world.im_view.clone());
+                // the buffer of the previous box is reused if the view has the same shape
+                match &mut self.initial_view {
+                    Some(iv) => core::restore_view(iv, &world.im_view),
+                    None => self.initial_view = Some(world.im_view.clone()),
+                }
             }
         }
         (world, history)
@@ -64,15 +78,10 @@ impl BBox {
         _key: VirtualKeyCode,
         shape_win: Shape,
         _mouse_pos: Option<(usize, usize)>,
-        mut world: World,
-        mut history: History,
+        world: World,
+        history: History,
     ) -> (World, History) {
-        if world.ims_raw.has_annotations() {
-            world.ims_raw.clear_annotations();
-            world.update_view(shape_win);
-            history.push(Record::new(world.ims_raw.clone(), ACTOR_NAME));
-        }
-        (world, history)
+        core::clear_annotations(world, history, shape_win, ACTOR_NAME)
     }
 }
 
@@ -92,9 +101,10 @@ impl Manipulate for BBox {
         mouse_pos: Option<(usize, usize)>,
         event: &WinitInputHelper,
     ) -> (World, History) {
-        if let (Some(mp), Some(pp)) = (mouse_pos, self.prev_pos) {
-            let iv = self.initial_view.clone();
-            world.im_view = core::draw_bx_on_view(iv.unwrap(), mp, pp, Rgb([255, 255, 255]));
+        if let (Some(mp), Some(pp), Some(iv)) = (mouse_pos, self.prev_pos, &self.initial_view) {
+            core::restore_view(&mut world.im_view, iv);
+            world.im_view =
+                core::draw_bx_on_view(mem::take(&mut world.im_view), mp, pp, Rgb([255, 255, 255]));
         }
         make_tool_transform!(
             self,
@@ -1,7 +1,8 @@
 use crate::{
     history::{History, Record},
     make_tool_transform,
-    util::{mouse_pos_to_orig_pos, Shape},
+    tools::core,
+    util::{mouse_pos_to_orig_pos, Shape, BB},
     world::World,
     LEFT_BTN, RIGHT_BTN,
 };
@@ -38,12 +39,31 @@ impl Brush {
                 let start = (mp_prev.0 as f32, mp_prev.1 as f32);
                 let end = (mp.0 as f32, mp.1 as f32);
                 let clr = Rgba([255, 255, 255, 255]);
-                drawing::draw_line_segment_mut(world.ims_raw.im_annotations_mut(), start, end, clr);
-                world.set_annotations_pixel(mp.0, mp.1, &[255, 255, 255, 255]);
-                let zoom_box = *world.zoom_box();
-                world
-                    .ims_raw
-                    .annotation_on_view(&mut world.im_view, shape_win, &zoom_box);
+                let is_moved = mp != mp_prev;
+                let im_annotations = world.ims_raw.im_annotations_mut();
+                // a line of length zero is just the pixel below the mouse
+                if is_moved {
+                    drawing::draw_line_segment_mut(im_annotations, start, end, clr);
+                }
+                // a resting mouse changes nothing once its pixel is drawn
+                let is_drawn = *im_annotations.get_pixel(mp.0, mp.1) == clr;
+                if is_moved || !is_drawn {
+                    world.set_annotations_pixel(mp.0, mp.1, &clr.0);
+                    // only the part of the view that shows the new stroke needs to be blended
+                    let stroke_bb = BB {
+                        x: mp.0.min(mp_prev.0),
+                        y: mp.1.min(mp_prev.1),
+                        w: mp.0.max(mp_prev.0) - mp.0.min(mp_prev.0) + 1,
+                        h: mp.1.max(mp_prev.1) - mp.1.min(mp_prev.1) + 1,
+                    };
+                    let zoom_box = *world.zoom_box();
+                    world.ims_raw.annotation_on_view(
+                        &mut world.im_view,
+                        shape_win,
+                        &zoom_box,
+                        &Some(stroke_bb),
+                    );
+                }
             }
             self.prev_pos = mp_orig;
         }
@@ -69,15 +89,10 @@ impl Brush {
         _key: VirtualKeyCode,
         shape_win: Shape,
         _mouse_pos: Option<(usize, usize)>,
-        mut world: World,
-        mut history: History,
+        world: World,
+        history: History,
     ) -> (World, History) {
-        if world.ims_raw.has_annotations() {
-            world.ims_raw.clear_annotations();
-            world.update_view(shape_win);
-            history.push(Record::new(world.ims_raw.clone(), ACTOR_NAME));
-        }
-        (world, history)
+        core::clear_annotations(world, history, shape_win, ACTOR_NAME)
     }
 }
 
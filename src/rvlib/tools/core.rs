@@ -1,8 +1,8 @@
-use image::{GenericImage, Rgb, Rgba};
+use image::{ImageBuffer, Pixel, Rgb, Rgba};
 use winit_input_helper::WinitInputHelper;
 
 use crate::{
-    history::History,
+    history::{History, Record},
     types::ViewImage,
     util::{self, Shape, BB},
     world::{AnnotationImage, World},
@@ -46,6 +46,31 @@ macro_rules! make_tool_transform {
     };
 }
 
+/// Removes all annotations and records the change, shared by the annotation tools
+pub fn clear_annotations(
+    mut world: World,
+    mut history: History,
+    shape_win: Shape,
+    actor_name: &'static str,
+) -> (World, History) {
+    if world.ims_raw.has_annotations() {
+        world.ims_raw.clear_annotations();
+        world.update_view(shape_win);
+        history.push(Record::new(world.ims_raw.clone(), actor_name));
+    }
+    (world, history)
+}
+
+/// Restores the view from a copy, e.g., before drawing a box that follows the mouse. The buffer of
+/// `im_view` is reused if the shapes match.
+pub fn restore_view(im_view: &mut ViewImage, initial_view: &ViewImage) {
+    if im_view.dimensions() == initial_view.dimensions() {
+        im_view.copy_from_slice(initial_view);
+    } else {
+        *im_view = initial_view.clone();
+    }
+}
+
 pub fn draw_bx_on_anno(
     im: AnnotationImage,
     corner_1: (usize, usize),
@@ -80,13 +105,13 @@ pub fn draw_bx_on_view(
     draw_bx_on_image(im, corner_1, corner_2, color, f)
 }
 
-pub fn draw_bx_on_image<I: GenericImage, F: Fn(I::Pixel) -> I::Pixel>(
-    mut im: I,
+pub fn draw_bx_on_image<P: Pixel, F: Fn(P) -> P>(
+    mut im: ImageBuffer<P, Vec<P::Subpixel>>,
     corner_1: (usize, usize),
     corner_2: (usize, usize),
-    color: I::Pixel,
+    color: P,
     fn_inner_color: F,
-) -> I {
+) -> ImageBuffer<P, Vec<P::Subpixel>> {
     let (p1_x, p1_y) = corner_1;
     let (p2_x, p2_y) = corner_2;
     let x_min = p1_x.min(p2_x);
@@ -99,17 +124,46 @@ pub fn draw_bx_on_image<I: GenericImage, F: Fn(I::Pixel) -> I::Pixel>(
         w: (x_max - x_min) as u32,
         h: (y_max - y_min) as u32,
     };
-    for x in draw_bx.x_range() {
-        im.put_pixel(x, draw_bx.y, color);
-        im.put_pixel(x, draw_bx.y + draw_bx.h - 1, color);
-    }
     for y in draw_bx.y_range() {
         im.put_pixel(draw_bx.x, y, color);
         im.put_pixel(draw_bx.x + draw_bx.w - 1, y, color);
     }
-    draw_bx.effect_per_inner_pixel(|x, y| {
-        let rgb = im.get_pixel(x, y);
-        im.put_pixel(x, y, fn_inner_color(rgb));
-    });
+    // horizontal edges are contiguous runs in the buffer and are filled at once
+    let n_channels = P::CHANNEL_COUNT as usize;
+    let width = im.width() as usize;
+    let row_start = |y: u32, x: u32| (y as usize * width + x as usize) * n_channels;
+    let buffer: &mut [P::Subpixel] = &mut *im;
+    for y in [draw_bx.y, draw_bx.y + draw_bx.h - 1] {
+        let start = row_start(y, draw_bx.x);
+        let end = start + draw_bx.w as usize * n_channels;
+        for p in buffer[start..end].chunks_exact_mut(n_channels) {
+            p.copy_from_slice(color.channels());
+        }
+    }
+    // only the rows of the box are visited and the inner part of each row is a contiguous run
+    let n_inner_subpixels = (draw_bx.w as usize).saturating_sub(2) * n_channels;
+    for y in (draw_bx.y + 1)..(draw_bx.y + draw_bx.h - 1) {
+        let start = row_start(y, draw_bx.x + 1);
+        for p in buffer[start..start + n_inner_subpixels].chunks_exact_mut(n_channels) {
+            let p = P::from_slice_mut(p);
+            *p = fn_inner_color(*p);
+        }
+    }
     im
 }
+
+#[test]
+fn test_draw_bx_on_image() {
+    let im = ViewImage::new(8, 8);
+    let im = draw_bx_on_image(im, (5, 6), (1, 2), Rgb([255, 255, 255]), |_| Rgb([7, 7, 7]));
+    for (x, y, p) in im.enumerate_pixels() {
+        let is_in_bx = (1..5).contains(&x) && (2..6).contains(&y);
+        let is_edge = x == 1 || x == 4 || y == 2 || y == 5;
+        let expected = match (is_in_bx, is_edge) {
+            (true, true) => [255, 255, 255],
+            (true, false) => [7, 7, 7],
+            _ => [0, 0, 0],
+        };
+        assert_eq!(p.0, expected, "pixel at ({}, {})", x, y);
+    }
+}
@@ -13,8 +13,7 @@ use super::Manipulate;
 const ACTOR_NAME: &str = "Rot90";
 
 /// rotate 90 degrees counter clockwise
-fn rot90(ims: &ImsRaw) -> ImsRaw {
-    let mut ims = ims.clone();
+fn rot90(mut ims: ImsRaw) -> ImsRaw {
     ims.apply(|im| im.rotate270(), |a| imageops::rotate270(&a));
     ims
 }
@@ -32,7 +31,9 @@ impl Rot90 {
     ) -> (World, History) {
         if key == VirtualKeyCode::R {
             history.push(Record::new(world.ims_raw.clone(), ACTOR_NAME));
-            world = World::new(rot90(&world.ims_raw), *world.zoom_box(), shape_win);
+            let zoom_box = *world.zoom_box();
+            // the history already holds a copy, so the raw images are rotated without cloning again
+            world = World::new(rot90(world.ims_raw), zoom_box, shape_win);
         }
         (world, history)
     }
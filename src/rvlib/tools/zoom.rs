@@ -1,5 +1,5 @@
 use image::Rgb;
-use std::fmt::Debug;
+use std::{fmt::Debug, mem};
 use winit::event::VirtualKeyCode;
 use winit_input_helper::WinitInputHelper;
 
@@ -22,10 +22,12 @@ fn make_zoom_on_release(
     shape_win: Shape,
     zoom_box: &Option<BB>,
 ) -> Option<BB> {
-    let prs_orig =
-        util::mouse_pos_to_orig_pos(Some(mouse_pos_start), shape_orig, shape_win, zoom_box);
-    let rel_orig =
-        util::mouse_pos_to_orig_pos(Some(mouse_pos_release), shape_orig, shape_win, zoom_box);
+    let [prs_orig, rel_orig] = util::mouse_poss_to_orig_poss(
+        [Some(mouse_pos_start), Some(mouse_pos_release)],
+        shape_orig,
+        shape_win,
+        zoom_box,
+    );
 
     match (prs_orig, rel_orig) {
         (Some((px, py)), Some((rx, ry))) => {
@@ -58,8 +60,12 @@ fn move_zoom_box(
     shape_win: Shape,
     zoom_box: Option<BB>,
 ) -> Option<BB> {
-    let press_orig = util::mouse_pos_to_orig_pos(Some(m_press), shape_orig, shape_win, &zoom_box);
-    let held_orig = util::mouse_pos_to_orig_pos(Some(m_held), shape_orig, shape_win, &zoom_box);
+    let [press_orig, held_orig] = util::mouse_poss_to_orig_poss(
+        [Some(m_press), Some(m_held)],
+        shape_orig,
+        shape_win,
+        &zoom_box,
+    );
     match (press_orig, held_orig, zoom_box) {
         (Some((px, py)), Some((hx, hy)), Some(c)) => {
             let x_shift: i32 = px as i32 - hx as i32;
@@ -131,7 +137,17 @@ impl Zoom {
             } else {
                 *world.zoom_box()
             };
-            world.set_zoom_box(bx, shape_win);
+            match &self.initial_view {
+                // the zoom did not change, so only the preview box needs to be removed
+                Some(iv)
+                    if bx == *world.zoom_box() && iv.dimensions() == world.im_view.dimensions() =>
+                {
+                    core::restore_view(&mut world.im_view, iv);
+                }
+                _ => {
+                    world.set_zoom_box(bx, shape_win);
+                }
+            }
             self.unset_mouse_start();
             (world, history)
         } else if btn == RIGHT_BTN {
@@ -167,10 +183,16 @@ impl Zoom {
             }
             (world, history)
         } else if btn == LEFT_BTN {
-            if let (Some(mps), Some(m)) = (self.mouse_pressed_start_pos, mouse_pos) {
-                let initial_view = self.initial_view.clone();
-                world.im_view =
-                    core::draw_bx_on_view(initial_view.unwrap(), mps, m, Rgb([255, 255, 255]));
+            if let (Some(mps), Some(m), Some(iv)) =
+                (self.mouse_pressed_start_pos, mouse_pos, &self.initial_view)
+            {
+                core::restore_view(&mut world.im_view, iv);
+                world.im_view = core::draw_bx_on_view(
+                    mem::take(&mut world.im_view),
+                    mps,
+                    m,
+                    Rgb([255, 255, 255]),
+                );
             }
             (world, history)
         } else {
@@ -1,7 +1,7 @@
 use std::{
     ffi::OsStr,
     io,
-    ops::{Add, Range, Sub},
+    ops::Range,
     path::{Path, PathBuf},
 };
 
@@ -11,7 +11,6 @@ use crate::{
     result::{to_rv, RvResult},
     types::{ResultImage, ViewImage},
 };
-use core::cmp::Ordering::{Greater, Less};
 use image::{buffer::ConvertBuffer, DynamicImage, GenericImage, ImageBuffer, Luma, Rgb, Rgba};
 use pixels::Pixels;
 use std::str::FromStr;
@@ -53,13 +52,13 @@ pub fn mouse_pos_transform(
         .ok()
 }
 
-/// Converts the mouse position to the coordinates of the original image
-pub fn view_pos_to_orig_pos(
-    view_pos: (u32, u32),
+/// Creates the transformation of view coordinates to coordinates of the original image. The
+/// shapes are computed once such that the transformation can be applied to many positions.
+pub fn make_view_pos_to_orig_pos(
     shape_orig: Shape,
     shape_win: Shape,
     zoom_box: &Option<BB>,
-) -> (u32, u32) {
+) -> impl Fn((u32, u32)) -> (u32, u32) {
     let unscaled = shape_unscaled(zoom_box, shape_orig);
     let scaled = shape_scaled(unscaled, shape_win);
 
@@ -71,10 +70,37 @@ pub fn view_pos_to_orig_pos(
     let coord_trans_2_orig = |x: u32, n_transformed: u32, n_orig: u32| -> u32 {
         (x as f64 / n_transformed as f64 * n_orig as f64) as u32
     };
-    let (x, y) = view_pos;
-    let x_orig = x_off + coord_trans_2_orig(x, scaled.w, unscaled.w);
-    let y_orig = y_off + coord_trans_2_orig(y, scaled.h, unscaled.h);
-    (x_orig, y_orig)
+    move |(x, y)| {
+        let x_orig = x_off + coord_trans_2_orig(x, scaled.w, unscaled.w);
+        let y_orig = y_off + coord_trans_2_orig(y, scaled.h, unscaled.h);
+        (x_orig, y_orig)
+    }
+}
+
+/// Converts the mouse position to the coordinates of the original image
+pub fn view_pos_to_orig_pos(
+    view_pos: (u32, u32),
+    shape_orig: Shape,
+    shape_win: Shape,
+    zoom_box: &Option<BB>,
+) -> (u32, u32) {
+    make_view_pos_to_orig_pos(shape_orig, shape_win, zoom_box)(view_pos)
+}
+
+/// Converts several mouse positions with one set up of the transformation. Positions outside of
+/// the original image are `None`.
+pub fn mouse_poss_to_orig_poss<const N: usize>(
+    mouse_poss: [Option<(usize, usize)>; N],
+    shape_orig: Shape,
+    shape_win: Shape,
+    zoom_box: &Option<BB>,
+) -> [Option<(u32, u32)>; N] {
+    let view_pos_to_orig_pos = make_view_pos_to_orig_pos(shape_orig, shape_win, zoom_box);
+    mouse_poss.map(|mouse_pos| {
+        mouse_pos
+            .map(|(x, y)| view_pos_to_orig_pos((x as u32, y as u32)))
+            .filter(|(x_orig, y_orig)| x_orig < &shape_orig.w && y_orig < &shape_orig.h)
+    })
 }
 
 pub fn mouse_pos_to_orig_pos(
@@ -83,9 +109,8 @@ pub fn mouse_pos_to_orig_pos(
     shape_win: Shape,
     zoom_box: &Option<BB>,
 ) -> Option<(u32, u32)> {
-    mouse_pos
-        .map(|(x, y)| view_pos_to_orig_pos((x as u32, y as u32), shape_orig, shape_win, zoom_box))
-        .filter(|(x_orig, y_orig)| x_orig < &shape_orig.w && y_orig < &shape_orig.h)
+    let [orig_pos] = mouse_poss_to_orig_poss([mouse_pos], shape_orig, shape_win, zoom_box);
+    orig_pos
 }
 pub fn read_image(path: &str) -> ResultImage {
     image::io::Reader::open(path)
@@ -135,15 +160,9 @@ pub fn shape_unscaled(zoom_box: &Option<BB>, shape_orig: Shape) -> Shape {
     zoom_box.map_or(shape_orig, |z| z.shape())
 }
 
-pub fn clipped_add<T>(x1: T, x2: T, clip_value: T) -> T
-where
-    T: Add<Output = T> + Sub<Output = T> + PartialOrd + Copy,
-{
-    if x1 >= clip_value || x2 >= clip_value || clip_value - x1 < x2 {
-        clip_value
-    } else {
-        x1 + x2
-    }
+/// Adds two channel values and clips the result at `clip_value` without branching
+pub fn clipped_add(x1: u8, x2: u8, clip_value: u8) -> u8 {
+    x1.saturating_add(x2).min(clip_value)
 }
 
 #[derive(Clone, Copy, Debug, PartialEq, Eq, Default)]
@@ -206,46 +225,40 @@ pub fn orig_to_0_255(
 ) -> ViewImage {
     let fn_rgb32f = |im: &ImageBuffer<Rgb<f32>, Vec<f32>>| {
         let mut im = im.clone();
-        let max_val = im
-            .as_raw()
-            .iter()
-            .copied()
-            .max_by(|a, b| {
-                if a.is_nan() {
-                    Greater
-                } else if b.is_nan() {
-                    Less
-                } else {
-                    a.partial_cmp(b).unwrap()
-                }
-            })
-            .expect("an image should have a maximum value");
+        // a NaN is treated as maximum and sticks once it has been seen
+        let max_val = im.iter().fold(f32::NEG_INFINITY, |max_val, x| {
+            if max_val >= *x || max_val.is_nan() {
+                max_val
+            } else {
+                *x
+            }
+        });
         if max_val <= 1.0 {
-            for y in 0..im.height() {
-                for x in 0..im.width() {
-                    let p = im.get_pixel_mut(x, y);
-                    p.0 = [p.0[0] * 255.0, p.0[1] * 255.0, p.0[2] * 255.0];
-                }
+            // all channels are scaled equally, so we can run over the flat sub-pixel buffer
+            for sub_pixel in im.iter_mut() {
+                *sub_pixel *= 255.0;
             }
         } else if max_val > 255.0 {
-            for y in 0..im.height() {
-                for x in 0..im.width() {
-                    let is_pixel_relevant = if let Some(im_mask) = im_mask {
-                        im_mask.get_pixel(x, y)[0] > 0
-                    } else {
-                        true
-                    };
-                    let p = im.get_pixel_mut(x, y);
-                    p.0 = if is_pixel_relevant {
-                        [
-                            p.0[0] / max_val * 255.0,
-                            p.0[1] / max_val * 255.0,
-                            p.0[2] / max_val * 255.0,
-                        ]
-                    } else {
-                        [0.0, 0.0, 0.0]
-                    };
+            let scale = |p: &mut Rgb<f32>| {
+                p.0 = [
+                    p.0[0] / max_val * 255.0,
+                    p.0[1] / max_val * 255.0,
+                    p.0[2] / max_val * 255.0,
+                ];
+            };
+            // the mask is checked once for the whole image and not for each pixel
+            match im_mask {
+                Some(im_mask) => {
+                    assert_eq!(im.dimensions(), im_mask.dimensions());
+                    for (p, m) in im.pixels_mut().zip(im_mask.pixels()) {
+                        if m[0] > 0 {
+                            scale(p);
+                        } else {
+                            p.0 = [0.0, 0.0, 0.0];
+                        }
+                    }
                 }
+                None => im.pixels_mut().for_each(scale),
             }
         }
         im.convert()
@@ -311,4 +324,23 @@ fn test_to_orig_pos() {
         }),
     );
     assert_eq!(Some((20, 20)), orig_pos);
+    let orig_poss = mouse_poss_to_orig_poss(
+        [Some((0, 0)), None, Some((10, 10)), Some((130, 10))],
+        Shape { w: 120, h: 120 },
+        Shape { w: 120, h: 120 },
+        &None,
+    );
+    assert_eq!([Some((0, 0)), None, Some((10, 10)), None], orig_poss);
+}
+
+#[test]
+fn test_clipped_add() {
+    for clip_value in 0..=255u8 {
+        for x1 in 0..=255u8 {
+            for x2 in 0..=255u8 {
+                let expected = (x1 as u16 + x2 as u16).min(clip_value as u16) as u8;
+                assert_eq!(clipped_add(x1, x2, clip_value), expected);
+            }
+        }
+    }
 }
@@ -1,8 +1,8 @@
-use std::{fmt::Debug, mem};
+use std::{fmt::Debug, mem, sync::Arc};
 
 use crate::result::{RvError, RvResult};
 use crate::types::ViewImage;
-use crate::util::{self, view_pos_to_orig_pos, Shape, BB};
+use crate::util::{self, Shape, BB};
 use image::{imageops, imageops::FilterType, DynamicImage, ImageBuffer, Rgb, Rgba};
 use pixels::Pixels;
 pub type AnnotationImage = ImageBuffer<Rgba<u8>, Vec<u8>>;
@@ -12,12 +12,16 @@ pub fn scaled_to_win_view(ims_raw: &ImsRaw, zoom_box: Option<BB>, shape_win: Sha
     let unscaled = util::shape_unscaled(&zoom_box, shape_orig);
     let new = util::shape_scaled(unscaled, shape_win);
     let im_view = if let Some(c) = zoom_box {
-        let mut ims_raw = ims_raw.clone();
-        ims_raw.apply(
-            |mut im| im.crop(c.x, c.y, c.w, c.h),
-            |mut a| imageops::crop(&mut a, c.x, c.y, c.w, c.h).to_image(),
-        );
-        ims_raw.to_uncropped_view()
+        // only the zoomed part is copied, not the full images
+        let ims_raw = ImsRaw {
+            im_background: Arc::new(ims_raw.im_background.crop_imm(c.x, c.y, c.w, c.h)),
+            im_annotations: ims_raw
+                .im_annotations
+                .as_ref()
+                .map(|a| imageops::crop_imm(a, c.x, c.y, c.w, c.h).to_image()),
+        };
+        // the cropped images are ours, so the view can take over the background buffer
+        ims_raw.into_uncropped_view()
     } else {
         ims_raw.to_uncropped_view()
     };
@@ -29,6 +33,7 @@ pub fn scaled_to_win_view(ims_raw: &ImsRaw, zoom_box: Option<BB>, shape_win: Sha
     }
 }
 
+#[cfg(test)]
 fn rgba_at(i: usize, im: &ViewImage) -> [u8; 4] {
     let x = (i % im.width() as usize) as u32;
     let y = (i / im.width() as usize) as u32;
@@ -37,8 +42,13 @@ fn rgba_at(i: usize, im: &ViewImage) -> [u8; 4] {
     [rgb_changed[0], rgb_changed[1], rgb_changed[2], 0xff]
 }
 
-fn to_01(x: u8) -> f32 {
-    x as f32 / 255.0
+// frame and view have the same number of pixels, hence we walk both in lockstep instead of
+// computing the coordinates of each pixel
+fn view_to_frame(im_view: &ViewImage, frame: &mut [u8]) {
+    for (pixel_frame, pixel_view) in frame.chunks_exact_mut(4).zip(im_view.pixels()) {
+        let [r, g, b] = pixel_view.0;
+        pixel_frame.copy_from_slice(&[r, g, b, 0xff]);
+    }
 }
 
 fn assert_data_is_valid(shape: Shape, im_anntoations: &Option<AnnotationImage>) -> RvResult<()> {
@@ -55,39 +65,49 @@ fn assert_data_is_valid(shape: Shape, im_anntoations: &Option<AnnotationImage>)
     Ok(())
 }
 
-fn add_annotation_to_view(
-    x_a: u32,
-    y_a: u32,
-    x_v: u32,
-    y_v: u32,
-    im_annotation: &AnnotationImage,
-    im_view: &mut ViewImage,
-) {
-    if im_annotation.get_pixel(x_a, y_a)[0] > 0 {
-        let pixel = *im_annotation.get_pixel(x_a, y_a);
-        let [r_anno, g_anno, b_anno, alpha_anno] = pixel.0;
-        let alpha_amount = to_01(alpha_anno);
-        let apply_alpha = |x_anno, x_res| {
-            ((to_01(x_anno) * alpha_amount + (1.0 - alpha_amount) * to_01(x_res)) * 255.0) as u8
+fn blend_annotation_pixel(pixel_anno: &Rgba<u8>, pixel_view: &mut Rgb<u8>) {
+    let [r_anno, g_anno, b_anno, alpha_anno] = pixel_anno.0;
+    if r_anno > 0 {
+        // blending stays in integers, the weighted sum is at most 255 * 255 and fits into u16
+        let apply_alpha = |x_anno: u8, x_res: u8| {
+            ((x_anno as u16 * alpha_anno as u16 + x_res as u16 * (255 - alpha_anno) as u16) / 255)
+                as u8
         };
-        let [r_bg, g_bg, b_bg] = im_view.get_pixel(x_v, y_v).0;
-        *im_view.get_pixel_mut(x_v, y_v) = Rgb([
+        let [r_bg, g_bg, b_bg] = pixel_view.0;
+        *pixel_view = Rgb([
             apply_alpha(r_anno, r_bg),
             apply_alpha(g_anno, g_bg),
             apply_alpha(b_anno, b_bg),
         ]);
     }
 }
+
+fn blend_annotations_uncropped(
+    mut im_view: ViewImage,
+    im_annotations: &Option<AnnotationImage>,
+) -> ViewImage {
+    if let Some(im_a) = im_annotations {
+        // view and annotations have the same shape, so we walk both buffers in lockstep
+        // instead of looking up every pixel by its coordinates
+        for (pixel_anno, pixel_view) in im_a.pixels().zip(im_view.pixels_mut()) {
+            blend_annotation_pixel(pixel_anno, pixel_view);
+        }
+    }
+    im_view
+}
+
 #[derive(Clone, Default, PartialEq)]
 pub struct ImsRaw {
-    im_background: DynamicImage,
+    // the background is shared between clones, e.g., in the history, and only copied when a tool
+    // changes it
+    im_background: Arc<DynamicImage>,
     im_annotations: Option<AnnotationImage>,
 }
 
 impl ImsRaw {
     pub fn new(im_background: DynamicImage) -> Self {
         ImsRaw {
-            im_background,
+            im_background: Arc::new(im_background),
             im_annotations: None,
         }
     }
@@ -109,10 +129,16 @@ impl ImsRaw {
         FI: FnMut(DynamicImage) -> DynamicImage,
         FA: FnMut(AnnotationImage) -> AnnotationImage,
     {
-        self.im_background = f_i(mem::take(&mut self.im_background));
+        let im_background = Arc::try_unwrap(mem::take(&mut self.im_background))
+            .unwrap_or_else(|im_shared| (*im_shared).clone());
+        self.im_background = Arc::new(f_i(im_background));
         self.im_annotations = mem::take(&mut self.im_annotations).map(f_a);
 
-        assert_data_is_valid(self.shape(), &self.im_annotations).expect("invalid data");
+        // the shape check is a sanity check of the tool implementations and not needed in release builds
+        debug_assert!(
+            assert_data_is_valid(self.shape(), &self.im_annotations).is_ok(),
+            "invalid data"
+        );
     }
 
     pub fn set_annotations_pixel(&mut self, x: u32, y: u32, value: &[u8; 4]) {
@@ -133,35 +159,61 @@ impl ImsRaw {
     }
 
     pub fn shape(&self) -> Shape {
-        Shape::from_im(&self.im_background)
+        Shape::from_im(&*self.im_background)
     }
 
     pub fn to_uncropped_view(&self) -> ViewImage {
-        let mut im_view = util::orig_to_0_255(&self.im_background, &None);
-        match &self.im_annotations {
-            Some(im_a) => {
-                util::effect_per_pixel(Shape::from_im(im_a), |x, y| {
-                    add_annotation_to_view(x, y, x, y, im_a, &mut im_view);
-                });
-            }
-            None => {}
-        }
-        im_view
+        let im_view = util::orig_to_0_255(&self.im_background, &None);
+        blend_annotations_uncropped(im_view, &self.im_annotations)
+    }
+
+    /// Like `to_uncropped_view` but an 8-bit RGB background is moved into the view instead of
+    /// being copied
+    pub fn into_uncropped_view(self) -> ViewImage {
+        let im_view = match Arc::try_unwrap(self.im_background) {
+            Ok(DynamicImage::ImageRgb8(im)) => im,
+            Ok(im) => util::orig_to_0_255(&im, &None),
+            Err(im_shared) => util::orig_to_0_255(&im_shared, &None),
+        };
+        blend_annotations_uncropped(im_view, &self.im_annotations)
     }
 
+    /// Blends the annotations onto the view. If `bb_orig` is passed, only view pixels that show the
+    /// given box of the original image are touched.
     pub fn annotation_on_view(
         &self,
         im_view: &mut ViewImage,
         shape_win: Shape,
         zoom_box: &Option<BB>,
+        bb_orig: &Option<BB>,
     ) {
         match &self.im_annotations {
             Some(im_a) => {
-                util::effect_per_pixel(Shape::from_im(im_view), |x_v, y_v| {
-                    let (x_a, y_a) =
-                        view_pos_to_orig_pos((x_v, y_v), Shape::from_im(im_a), shape_win, zoom_box);
-                    add_annotation_to_view(x_a, y_a, x_v, y_v, im_a, im_view);
-                });
+                let shape_a = Shape::from_im(im_a);
+                // the transformation does not depend on the pixel and is set up only once
+                let view_pos_to_orig_pos =
+                    util::make_view_pos_to_orig_pos(shape_a, shape_win, zoom_box);
+                let (x_range_a, y_range_a) = match bb_orig {
+                    Some(bb) => (bb.x_range(), bb.y_range()),
+                    None => (0..shape_a.w, 0..shape_a.h),
+                };
+                // x and y are transformed independently, so one lookup table per axis replaces
+                // the transformation of each pixel. Only view coordinates inside the box are kept.
+                let Shape { w, h } = Shape::from_im(im_view);
+                let xs = (0..w)
+                    .map(|x_v| (x_v, view_pos_to_orig_pos((x_v, 0)).0))
+                    .filter(|(_, x_a)| x_range_a.contains(x_a))
+                    .collect::<Vec<_>>();
+                let ys = (0..h)
+                    .map(|y_v| (y_v, view_pos_to_orig_pos((0, y_v)).1))
+                    .filter(|(_, y_a)| y_range_a.contains(y_a))
+                    .collect::<Vec<_>>();
+                for (y_v, y_a) in &ys {
+                    for (x_v, x_a) in &xs {
+                        let pixel_anno = im_a.get_pixel(*x_a, *y_a);
+                        blend_annotation_pixel(pixel_anno, im_view.get_pixel_mut(*x_v, *y_v));
+                    }
+                }
             }
             None => {}
         }
@@ -196,12 +248,7 @@ impl World {
         if frame_len != w_view * h_view * 4 {
             pixels.resize_buffer(w_view, h_view);
         }
-        let frame = pixels.get_frame();
-
-        for (i, pixel) in frame.chunks_exact_mut(4).enumerate() {
-            let rgba = rgba_at(i, &self.im_view);
-            pixel.copy_from_slice(&rgba);
-        }
+        view_to_frame(&self.im_view, pixels.get_frame());
     }
     pub fn new(ims_raw: ImsRaw, zoom_box: Option<BB>, shape_win: Shape) -> Self {
         let im_view = scaled_to_win_view(&ims_raw, zoom_box, shape_win);
@@ -256,6 +303,19 @@ fn test_rgba() {
     assert_eq!(rgba_at(11 * 64 + 7, &im_test), [23, 23, 23, 255]);
 }
 
+#[test]
+fn test_view_to_frame() {
+    let mut im_test = ViewImage::new(16, 8);
+    im_test.put_pixel(0, 0, Rgb([23, 24, 25]));
+    im_test.put_pixel(7, 3, Rgb([1, 2, 3]));
+    im_test.put_pixel(15, 7, Rgb([255, 0, 255]));
+    let mut frame = vec![0u8; 16 * 8 * 4];
+    view_to_frame(&im_test, &mut frame);
+    for (i, pixel) in frame.chunks_exact(4).enumerate() {
+        assert_eq!(pixel, rgba_at(i, &im_test));
+    }
+}
+
 #[test]
 fn test_ims_raw() -> RvResult<()> {
     let im = DynamicImage::ImageRgb8(ViewImage::new(64, 64));
@@ -284,6 +344,12 @@ fn test_ims_raw() -> RvResult<()> {
         // 10% fewer background image plus 10% from the annotations image
         assert_eq!(*im_view.get_pixel(x, y), Rgb([92, 92, 92]));
     });
+    let ims_raw_clone = ims_raw.clone();
+    assert!(Arc::ptr_eq(
+        &ims_raw.im_background,
+        &ims_raw_clone.im_background
+    ));
+    assert_eq!(ims_raw.into_uncropped_view(), im_view);
 
     Ok(())
 }
@@ -303,3 +369,28 @@ fn test_scale_to_win() -> RvResult<()> {
     assert_eq!(im_scaled.get_pixel(70, 70).0, [0, 0, 0]);
     Ok(())
 }
+
+#[test]
+fn test_annotation_on_view_in_bb() {
+    let shape = Shape::new(16, 16);
+    let mut ims_raw = ImsRaw::new(DynamicImage::ImageRgb8(ViewImage::new(shape.w, shape.h)));
+    ims_raw.im_annotations_mut().fill(255);
+    let mut im_view = ViewImage::new(shape.w, shape.h);
+    let bb = BB {
+        x: 2,
+        y: 3,
+        w: 4,
+        h: 5,
+    };
+    ims_raw.annotation_on_view(&mut im_view, shape, &None, &Some(bb));
+    for (x, y, p) in im_view.enumerate_pixels() {
+        let expected = if bb.x_range().contains(&x) && bb.y_range().contains(&y) {
+            [255, 255, 255]
+        } else {
+            [0, 0, 0]
+        };
+        assert_eq!(p.0, expected);
+    }
+    ims_raw.annotation_on_view(&mut im_view, shape, &None, &None);
+    assert!(im_view.pixels().all(|p| p.0 == [255, 255, 255]));
+}